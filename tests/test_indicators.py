@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.indicators import _indicators
+
+
+def _reference(close):
+    """The pandas formulas the fused kernel replaces."""
+    close = pd.Series(close)
+    sma = close.rolling(window=20).mean()
+
+    # Wilder RSI: mean of the first 14 moves, then ewm(alpha=1/14) from there on
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = (-delta).clip(lower=0)
+    avg_gain = pd.concat([pd.Series([gain.iloc[1:15].mean()], index=[14]), gain.iloc[15:]]).ewm(alpha=1/14, adjust=False).mean()
+    avg_loss = pd.concat([pd.Series([loss.iloc[1:15].mean()], index=[14]), loss.iloc[15:]]).ewm(alpha=1/14, adjust=False).mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = pd.Series(np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss)), index=avg_gain.index)
+    rsi = rsi.reindex(close.index)
+
+    ema12 = close.ewm(span=12, adjust=False).mean()
+    ema26 = close.ewm(span=26, adjust=False).mean()
+    macd = ema12 - ema26
+    signal = macd.ewm(span=9, adjust=False).mean()
+    return sma, rsi, macd, signal
+
+
+@pytest.mark.parametrize("gaps", [[], [0], [3, 40], [10, 11, 12], [30, 31, 32, 33, 34, 35, 36]])
+def test_kernel_matches_pandas(gaps):
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(size=120))
+    # Repeated prices exercise the flat-move branches as well
+    close[50:53] = close[50]
+    close[gaps] = np.nan
+
+    for got, expected in zip(_indicators(close), _reference(close)):
+        np.testing.assert_allclose(got, expected.to_numpy(), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_nan_close_does_not_poison_the_rest_of_the_series():
+    close = np.linspace(10.0, 20.0, 80)
+    close[30] = np.nan
+
+    sma, rsi, macd, signal = _indicators(close)
+
+    assert np.isfinite(sma[50:]).all()
+    assert np.isfinite(rsi[40:]).all()
+    assert np.isfinite(macd).all()
+    assert np.isfinite(signal).all()
@@ -0,0 +1,14 @@
+import streamlit as st
+
+def display_data_info(data, source):
+    """Display information about the loaded data"""
+    st.info(f"""
+    📋 **Data Information for {source}:**
+    - Total Records: {len(data):,}
+    - Date Range: {data.index.min().strftime('%Y-%m-%d')} to {data.index.max().strftime('%Y-%m-%d')}
+    - Columns: {', '.join(data.columns.tolist())}
+    """)
+
+def process_stock_data(data):
+    """Placeholder for data processing, mimicking app (1).py"""
+    return data  # Replace with actual processing if needed
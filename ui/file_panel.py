@@ -0,0 +1,47 @@
+import streamlit as st
+import logging
+from ui.common import display_data_info, process_stock_data
+from utils.data_loader import load_file_data
+
+logger = logging.getLogger(__name__)
+
+# Sample file offered on the File Import page; constant, so built once rather than per rerun
+SAMPLE_CSV = (
+    "date,open,high,low,close,volume\n"
+    "2025-06-20,2.0,2.1,1.9,2.05,100000\n"
+    "2025-06-19,1.95,2.0,1.9,2.0,99999\n"
+)
+
+def render_file_panel():
+    """Render the file upload panel with its sample download and Clear button."""
+    st.header("File Import")
+    uploaded_file = st.file_uploader("Upload .csv or .xlsx file", type=["csv", "xlsx"])
+    if uploaded_file:
+        st.markdown("File data uploaded. Click 'Process' to load the data.")
+        st.markdown("File must contain columns: Date (index), open, high, low, close, volume.")
+    
+    st.download_button("Download Sample CSV", data=SAMPLE_CSV, file_name="sample_stock_data.csv")
+    
+    if st.button("📤 Process", key="process_file", type="primary"):
+        try:
+            with st.spinner("Processing uploaded file..."):
+                st.session_state.data = load_file_data(uploaded_file)
+                st.session_state.processed_data = process_stock_data(st.session_state.data)
+                st.session_state.prediction = None
+                st.session_state.max_range = None
+                st.success("✅ File processed successfully")
+                display_data_info(st.session_state.data, "Uploaded File")
+                st.rerun()
+        except ValueError as e:
+            logger.error(f"Error processing file: {str(e)}")
+            st.error(f"❌ Error processing file: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error processing file: {str(e)}")
+            st.error(f"❌ Unexpected error processing file: {str(e)}")
+    
+    if st.button("🔄 Clear", key="clear_file", type="secondary"):
+        st.session_state.data = None
+        st.session_state.processed_data = None
+        st.session_state.prediction = None
+        st.session_state.max_range = None
+        st.rerun()
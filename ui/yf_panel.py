@@ -0,0 +1,108 @@
+import streamlit as st
+import pandas as pd
+import re
+from datetime import date, timedelta
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from ui.common import display_data_info, process_stock_data
+from utils.data_loader import load_available_range, load_yfinance_data
+
+logger = logging.getLogger(__name__)
+
+def display_yfinance_interface():
+    st.subheader("YFinance Data Retrieval")
+    
+    # Period type stays outside the form so switching it re-renders the inputs below
+    period_type = st.selectbox(
+        "Period Type",
+        ["Predefined", "Custom Range"]
+    )
+    
+    # Inputs are batched in a form so editing them doesn't rerun the whole app
+    with st.form("yf_form"):
+        # Stock symbol input
+        symbol = st.text_input(
+            "Enter Stock Symbol",
+            value=st.session_state.symbol,
+            placeholder="e.g., AAPL, MSFT, GOOGL"
+        ).upper()
+        
+        # Period selection
+        if period_type == "Predefined":
+            period = st.selectbox(
+                "Select Period",
+                ["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max"],
+                index=5  # Default to 1y
+            )
+            start_date = None
+            end_date = None
+        else:
+            st.write("Custom Date Range")
+            today = date.today()
+            col3, col4 = st.columns(2)
+            with col3:
+                start_date = st.date_input("Start Date", today - timedelta(days=365))
+            with col4:
+                end_date = st.date_input("End Date", today)
+            period = None
+        
+        submit = st.form_submit_button("📥 Download Data", type="primary")
+    
+    if symbol == "CING":
+        st.info("CING data is available from December 2021. Use periods like 1mo or Custom (post-2021).")
+    
+    if submit:
+        if symbol:
+            if not re.match(r'^[A-Z0-9.-]+$', symbol):
+                st.error("❌ Please enter a valid stock symbol (e.g., AAPL, CING)")
+            elif period_type == "Custom Range" and (
+                pd.Timestamp(start_date) >= pd.Timestamp(end_date) or 
+                pd.Timestamp(end_date) > pd.Timestamp.now()
+            ):
+                st.error("❌ Start date must be before end date, and end date cannot be in the future")
+            else:
+                with st.spinner("Downloading data from YFinance..."):
+                    try:
+                        # Fetch the data and the available range concurrently
+                        with ThreadPoolExecutor(max_workers=2) as executor:
+                            data_future = executor.submit(load_yfinance_data, symbol, period, start_date, end_date)
+                            range_future = executor.submit(load_available_range, symbol)
+                            data = data_future.result()
+                            max_range = range_future.result()
+                        st.session_state.data = data
+                        st.session_state.max_range = max_range
+                        st.session_state.symbol = symbol
+                        st.session_state.period = period if period else f"{start_date} to {end_date}"
+                        
+                        # Process data
+                        st.session_state.processed_data = process_stock_data(data)
+                        st.session_state.prediction = None
+                        
+                        st.success(f"✅ Data downloaded successfully for {symbol}")
+                        
+                        # Display data info
+                        display_data_info(data, symbol)
+                        st.rerun()
+                    except ValueError as e:
+                        logger.error(f"Error in yfinance download: {str(e)}")
+                        st.error(f"❌ {str(e)}")
+                    except Exception as e:
+                        logger.error(f"Exception in yfinance download: {str(e)}")
+                        st.error(f"❌ Error downloading data: {str(e)}")
+        else:
+            st.warning("⚠️ Please enter a stock symbol")
+
+def render_yf_panel():
+    """Render the Yahoo Finance retrieval panel alongside its Clear button."""
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        display_yfinance_interface()
+    with col2:
+        if st.button("🔄 Clear", key="clear", type="secondary"):
+            st.session_state.data = None
+            st.session_state.symbol = "AAPL"
+            st.session_state.period = "1y"
+            st.session_state.processed_data = None
+            st.session_state.prediction = None
+            st.session_state.max_range = None
+            st.rerun()
@@ -0,0 +1,96 @@
+import pandas as pd
+import numpy as np
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# On-disk parquet cache shared across sessions and server restarts
+CACHE_DIR = ".cache"
+# Per-symbol daily bars, extended with only the new tail on each fetch
+HISTORY_DIR = os.path.join(CACHE_DIR, "history")
+
+# Entries kept by each st.cache_data function keyed on frame_fingerprint
+FRAME_CACHE_ENTRIES = 32
+
+# Seconds a cached download is served before it is refetched
+DEFAULT_TTL = 300
+# Intraday bars change every minute, so they expire sooner
+INTRADAY_TTL = 60
+# Ranges that ended before today never change
+HISTORICAL_TTL = 7 * 24 * 3600
+
+# Serve the last cached copy, marked expired, when a refetch fails
+CACHE_FALLBACK = True
+
+def make_key(*parts):
+    """Build a stable cache key from the given parts."""
+    return hashlib.md5("|".join(str(part) for part in parts).encode()).hexdigest()
+
+def frame_fingerprint(data):
+    """Content fingerprint of an OHLCV frame for st.cache_data hash_funcs; derived columns follow from these."""
+    digest = hashlib.md5(repr(tuple(data.columns)).encode())
+    digest.update(np.ascontiguousarray(data.index.asi8))
+    for col in ('open', 'high', 'low', 'close', 'volume'):
+        if col in data.columns:
+            values = data[col].to_numpy()
+            digest.update(values.dtype.str.encode())
+            digest.update(np.ascontiguousarray(values))
+    return digest.hexdigest()
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.parquet")
+
+def read_frame(key, max_age=None):
+    """Return the cached DataFrame for key, or None if missing or older than max_age seconds."""
+    path = _cache_path(key)
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(path) >= max_age:
+            return None
+        return pd.read_parquet(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Unable to read cached frame {path}: {str(e)}")
+        return None
+
+def _write_parquet(path, data):
+    """Atomically write data to path; failures are logged and otherwise ignored."""
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a uniquely named temporary file first, so concurrent writers in other threads
+        # or processes never share it and readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        data.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Unable to write cached frame {path}: {str(e)}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def write_frame(key, data):
+    """Store a DataFrame under key; failures are logged and otherwise ignored."""
+    _write_parquet(_cache_path(key), data)
+
+def _history_path(symbol):
+    return os.path.join(HISTORY_DIR, f"{symbol}.parquet")
+
+def get_cached(symbol):
+    """Return the symbol's stored daily history, or None if there is none."""
+    path = _history_path(symbol)
+    try:
+        return pd.read_parquet(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Unable to read cached history {path}: {str(e)}")
+        return None
+
+def put_cached(symbol, data):
+    """Replace the symbol's stored daily history; its attrs record the range it covers."""
+    _write_parquet(_history_path(symbol), data)
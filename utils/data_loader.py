@@ -1,59 +1,146 @@
 import pandas as pd
+import hashlib
 import logging
 import streamlit as st
-from datetime import datetime
-from utils.yfetch import fetch_yfinance_data
+from utils._cache import make_key, read_frame, write_frame
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# OHLCV columns kept from a download, and their lowercase names used throughout the app
+_REQUIRED = ['Open', 'High', 'Low', 'Close', 'Volume']
+_RENAME = {col: col.lower() for col in _REQUIRED}
+
+class _StaleDataError(Exception):
+    """Carries a stale copy out of _load_historical so it is shown without being persisted."""
+    def __init__(self, data):
+        super().__init__("Serving a stale cached copy")
+        self.data = data
+
+@st.cache_data(persist="disk", show_spinner=False)
+def _load_historical(symbol, start_date, end_date):
+    """Fetch a date range that ends before today; its bars never change, so it is persisted to disk."""
+    from utils.yfetch import fetch_yfinance_data
+    data = fetch_yfinance_data(symbol, start_date=start_date, end_date=end_date)
+    if data.empty:
+        # Raising keeps an empty, possibly transient, result out of the persistent cache
+        raise ValueError(f"No data found for {symbol} between {start_date} and {end_date}")
+    if data.attrs.get('expired'):
+        # A stale copy served during an outage must not outlive it in the persistent cache
+        raise _StaleDataError(data)
+    return data
+
 @st.cache_data(ttl=60)
 def load_yfinance_data(symbol, period, start_date=None, end_date=None):
-    """Load stock data from yfinance for the given symbol and period."""
+    """Load stock data from yfinance for a yfinance period, or a custom range when period is None or "Custom"."""
+    # Imported here so the File Import path never loads yfinance, numba and the HTTP session
+    from utils.yfetch import fetch_yfinance_data, is_valid_symbol, symbol_range
     try:
-        logger.info(f"Loading data for {symbol}, period: {period}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Loading data for {symbol}, period: {period}, start: {start_date}, end: {end_date}")
         
-        if period == "Custom":
-            if start_date >= end_date:
+        if period in (None, "Custom"):
+            period_label = f"{start_date} to {end_date}"
+            start, end, now = pd.Timestamp(start_date), pd.Timestamp(end_date), pd.Timestamp.now()
+            if start >= end:
                 raise ValueError("Start date must be before end date")
-            if end_date > datetime.now():
+            if end > now:
                 raise ValueError("End date cannot be in the future")
-            data = fetch_yfinance_data(symbol, start_date=start_date, end_date=end_date)
+            if end <= now.normalize():
+                try:
+                    data = _load_historical(symbol, start_date, end_date)
+                except _StaleDataError as e:
+                    data = e.data
+                except ValueError:
+                    data = pd.DataFrame()
+            else:
+                data = fetch_yfinance_data(symbol, start_date=start_date, end_date=end_date)
         else:
-            data = fetch_yfinance_data(symbol, period=period)
+            period_label = period
+            data = fetch_yfinance_data(symbol, period=period, fallback="1mo")
         
         if data.empty:
-            suggestions = "real-time, 1mo, ytd, Custom (post-2021)" if symbol == "CING" else "real-time, 1mo, ytd, Custom"
+            # None means Yahoo couldn't be reached, which says nothing about the symbol
+            if is_valid_symbol(symbol) is False:
+                raise ValueError(f"Unknown symbol {symbol}. Check the ticker and try again.")
+            suggestions = "1mo, Custom (post-2021)" if symbol == "CING" else "1mo, ytd, Custom"
+            available = symbol_range(symbol)
+            available_note = f" Data is available from {available[0]} to {available[1]}." if available else ""
             raise ValueError(
-                f"No data found for {symbol} in period {period}. "
-                f"Try a period like {suggestions}, another symbol (e.g., AAPL), or use File Import."
+                f"No data found for {symbol} in period {period_label}.{available_note} "
+                f"Try a period like {suggestions}, another symbol (e.g., AAPL), or File Import."
             )
         
-        required_columns = {'open', 'high', 'low', 'close', 'volume'}
-        if not all(col in data.columns for col in required_columns):
-            raise ValueError(f"Data missing required columns: {required_columns}")
+        if not set(_REQUIRED).issubset(data.columns):
+            raise ValueError(f"Data missing required columns: {_REQUIRED}")
+        data = data.reindex(columns=_REQUIRED, copy=False).rename(columns=_RENAME, copy=False)
         
-        data.columns = [col.lower() for col in data.columns]
-        logger.info(f"Successfully loaded data for {symbol}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"Successfully loaded data for {symbol}")
         return data
     
     except Exception as e:
         logger.error(f"Error loading data for {symbol}: {str(e)}")
         raise ValueError(f"Failed to load data for {symbol}: {str(e)}")
 
+def load_available_range(symbol):
+    """Return the (first, last) dates of the symbol's available history, or None if it can't be fetched."""
+    from utils.yfetch import symbol_range
+    try:
+        return symbol_range(symbol)
+    except Exception as e:
+        logger.warning(f"Unable to fetch historical data range for {symbol}: {str(e)}")
+        return None
+
+# Column dtypes for uploaded files; float32 prices halve memory and parsing work. Volume is
+# parsed as nullable Int64 so blank cells load, then filled with 0 like downloaded bars
+_FILE_DTYPES = {'open': 'float32', 'high': 'float32', 'low': 'float32', 'close': 'float32', 'volume': 'Int64'}
+
+# Rows parsed per chunk when reading uploaded CSVs
+CSV_CHUNK_ROWS = 100_000
+
+def _select_columns(columns):
+    """Map the file's OHLCV column names (in any case) to their dtypes, raising if any are missing."""
+    selected = {col: _FILE_DTYPES[str(col).lower()] for col in columns if str(col).lower() in _FILE_DTYPES}
+    if len({str(col).lower() for col in selected}) < len(_FILE_DTYPES):
+        raise ValueError("File must contain columns: Open, High, Low, Close, Volume")
+    return selected
+
+def _hash_upload(uploaded_file):
+    """Hash an upload by name and content so re-renders of the same bytes hit the cache."""
+    digest = hashlib.md5(uploaded_file.getbuffer()).hexdigest()
+    return f"{uploaded_file.name}:{digest}"
+
+@st.cache_data(
+    hash_funcs={"streamlit.runtime.uploaded_file_manager.UploadedFile": _hash_upload},
+    persist="disk",
+    show_spinner=False,
+)
 def load_file_data(uploaded_file):
     """Load stock data from uploaded .csv or .xlsx file."""
     try:
         logger.info(f"Processing uploaded file: {uploaded_file.name}")
+        uploaded_file.seek(0)
         if uploaded_file.name.endswith('.csv'):
-            data = pd.read_csv(uploaded_file, index_col=0, parse_dates=True)
+            # Read the header first so only the date index and OHLCV columns are parsed, with fixed dtypes
+            header = pd.read_csv(uploaded_file, nrows=0).columns
+            uploaded_file.seek(0)
+            dtypes = _select_columns(header[1:])
+            # Parse in bounded chunks so large uploads don't need one giant parse buffer
+            reader = pd.read_csv(uploaded_file, index_col=0, parse_dates=True, usecols=[header[0], *dtypes],
+                                 dtype=dtypes, engine='c', chunksize=CSV_CHUNK_ROWS)
+            data = pd.concat(reader)
         else:
-            data = pd.read_excel(uploaded_file, index_col=0, parse_dates=True)
+            # openpyxl is the slowest ingest path, so keep a parquet copy keyed by content hash
+            cache_key = make_key("xlsx", _hash_upload(uploaded_file))
+            data = read_frame(cache_key)
+            if data is None:
+                data = pd.read_excel(uploaded_file, index_col=0, parse_dates=True, engine='openpyxl')
+                dtypes = _select_columns(data.columns)
+                data = data[list(dtypes)].astype(dtypes)
+                write_frame(cache_key, data)
+        data.columns = data.columns.str.lower()
+        data['volume'] = data['volume'].fillna(0).astype('int64')
         
-        required_columns = {'open', 'high', 'low', 'close', 'volume'}
-        if not all(col.lower() in data.columns.str.lower() for col in required_columns):
-            raise ValueError("File must contain columns: Open, High, Low, Close, Volume")
         if data.empty:
             raise ValueError("Uploaded file contains no data")
         if not pd.api.types.is_datetime64_any_dtype(data.index):
@@ -1,23 +1,115 @@
 import pandas as pd
+import numpy as np
+import streamlit as st
+from numba import njit
+from utils._cache import FRAME_CACHE_ENTRIES, frame_fingerprint
 
+@njit(cache=True)
+def _ewm_update(mean, old_wt, x, alpha):
+    """Advance a pandas ewm(adjust=False) mean by x; a NaN x is skipped but still ages the mean's weight."""
+    if mean != mean:
+        # No observation yet: the first one seeds the mean
+        if x == x:
+            return x, 1.0
+        return mean, old_wt
+    old_wt *= 1.0 - alpha
+    if x == x:
+        mean = (old_wt * mean + alpha * x) / (old_wt + alpha)
+        old_wt = 1.0
+    return mean, old_wt
+
+@njit(cache=True)
+def _indicators(close):
+    """Compute SMA(20), Wilder RSI(14) and MACD(12, 26, 9) in a single pass over close prices.
+
+    NaN closes are handled like pandas: a rolling window containing one is NaN, and the
+    exponential averages skip it and carry on, rather than staying NaN for the rest of the series.
+    """
+    n = close.shape[0]
+    sma = np.full(n, np.nan)
+    rsi = np.full(n, np.nan)
+    macd = np.full(n, np.nan)
+    signal = np.full(n, np.nan)
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    a14 = 1.0 / 14.0
+    window_sum = 0.0
+    window_count = 0
+    seed_gain = 0.0
+    seed_loss = 0.0
+    seed_count = 0
+    avg_gain = np.nan
+    avg_loss = np.nan
+    gain_wt = 1.0
+    loss_wt = 1.0
+    ema12 = np.nan
+    ema26 = np.nan
+    ema9 = np.nan
+    wt12 = 1.0
+    wt26 = 1.0
+    wt9 = 1.0
+    for i in range(n):
+        c = close[i]
+
+        # SMA: running sum over the trailing 20 closes, NaN while any of them is missing
+        if c == c:
+            window_sum += c
+            window_count += 1
+        if i >= 20:
+            old = close[i - 20]
+            if old == old:
+                window_sum -= old
+                window_count -= 1
+        if window_count == 20:
+            sma[i] = window_sum / 20.0
+
+        # RSI: seeded with the mean of the first 14 moves, then Wilder-smoothed
+        if i > 0:
+            delta = c - close[i - 1]
+            if delta == delta:
+                gain = delta if delta > 0.0 else 0.0
+                loss = -delta if delta < 0.0 else 0.0
+            else:
+                gain = np.nan
+                loss = np.nan
+            if i <= 14:
+                if delta == delta:
+                    seed_gain += gain
+                    seed_loss += loss
+                    seed_count += 1
+                if i == 14 and seed_count > 0:
+                    avg_gain = seed_gain / seed_count
+                    avg_loss = seed_loss / seed_count
+            else:
+                avg_gain, gain_wt = _ewm_update(avg_gain, gain_wt, gain, a14)
+                avg_loss, loss_wt = _ewm_update(avg_loss, loss_wt, loss, a14)
+            if i >= 14:
+                rsi[i] = 100.0 if avg_loss == 0.0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        # MACD: EMAs matching pandas ewm(adjust=False), seeded with the first close
+        ema12, wt12 = _ewm_update(ema12, wt12, c, a12)
+        ema26, wt26 = _ewm_update(ema26, wt26, c, a26)
+        macd[i] = ema12 - ema26
+        ema9, wt9 = _ewm_update(ema9, wt9, macd[i], a9)
+        signal[i] = ema9
+
+    return sma, rsi, macd, signal
+
+# Compile (or load the on-disk cached build) at import rather than on the first rerun
+_indicators(np.zeros(1))
+
+@st.cache_data(show_spinner=False, max_entries=FRAME_CACHE_ENTRIES, hash_funcs={pd.DataFrame: frame_fingerprint})
 def calculate_indicators(data):
     """Calculate technical indicators: SMA, RSI, MACD."""
-    df = data.copy()
-    
-    # Simple Moving Average (20-day)
-    df['SMA_20'] = df['close'].rolling(window=20).mean()
-    
-    # Relative Strength Index (14-day)
-    delta = df['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df['RSI_14'] = 100 - (100 / (1 + rs))
-    
-    # MACD (12, 26, 9)
-    ema12 = df['close'].ewm(span=12, adjust=False).mean()
-    ema26 = df['close'].ewm(span=26, adjust=False).mean()
-    df['MACD'] = ema12 - ema26
-    df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-    
-    return df
+    sma_20, rsi_14, macd, macd_signal = _indicators(data['close'].to_numpy(np.float64))
+
+    # Attach the new columns alongside the input instead of copying it first
+    indicators = pd.DataFrame({
+        'SMA_20': sma_20,
+        'RSI_14': rsi_14,
+        'MACD': macd,
+        'MACD_Signal': macd_signal
+    }, index=data.index)
+
+    return pd.concat([data, indicators], axis=1, copy=False)
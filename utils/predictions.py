@@ -1,26 +1,60 @@
 import pandas as pd
-from prophet import Prophet
+import numpy as np
+import streamlit as st
+import functools
 import plotly.express as px
 
-def predict_prices(data, horizon):
-    """Predict future prices using Prophet."""
-    df = data[['close']].reset_index().rename(columns={'Date': 'ds', 'close': 'y'})
-    
-    # Train Prophet model
-    model = Prophet(daily_seasonality=True)
-    model.fit(df)
-    
-    # Create future dataframe
+# Horizons up to this many days use exponential smoothing instead of Prophet
+SHORT_HORIZON_DAYS = 14
+
+@functools.lru_cache(maxsize=1)
+def _get_prophet_cls():
+    """Import Prophet on first use; it loads cmdstanpy and its Stan models, adding seconds to startup."""
+    from prophet import Prophet
+    return Prophet
+
+def _forecast_prophet(ds, y, horizon):
+    """Fit Prophet and return the future rows of its forecast."""
+    model = _get_prophet_cls()(daily_seasonality=True)
+    model.fit(pd.DataFrame({'ds': ds, 'y': y}))
     future = model.make_future_dataframe(periods=horizon)
     forecast = model.predict(future)
-    
+    return forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(horizon)
+
+def _forecast_ets(ds, y, horizon):
+    """Fit additive-trend exponential smoothing, an order of magnitude cheaper than Prophet for short horizons."""
+    from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+    fit = ETSModel(pd.Series(y, dtype=np.float64), error='add', trend='add').fit(disp=False)
+    # 80% interval, matching Prophet's default interval_width
+    summary = fit.get_prediction(start=len(y), end=len(y) + horizon - 1).summary_frame(alpha=0.2)
+    return pd.DataFrame({
+        'ds': pd.date_range(pd.Timestamp(ds[-1]) + pd.Timedelta(days=1), periods=horizon, freq='D'),
+        'yhat': summary['mean'].to_numpy(),
+        'yhat_lower': summary['pi_lower'].to_numpy(),
+        'yhat_upper': summary['pi_upper'].to_numpy()
+    })
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _forecast(ds, y, horizon):
+    """Forecast horizon days ahead; cached on the raw arrays so unchanged data is never refit."""
+    if horizon <= SHORT_HORIZON_DAYS:
+        return _forecast_ets(ds, y, horizon)
+    return _forecast_prophet(ds, y, horizon)
+
+def predict_prices(data, horizon):
+    """Predict future prices using Prophet, or exponential smoothing for short horizons."""
+    # Only ds/y are needed: naive ns timestamps and float32 closes keep Prophet's copies small
+    ds = data.index.tz_localize(None).to_numpy('datetime64[ns]')
+    y = data['close'].to_numpy(np.float32)
+
     # Filter predictions for future dates
-    pred_df = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(horizon)
-    pred_df.columns = ['Date', 'Predicted Close', 'Lower Bound', 'Upper Bound']
-    
+    pred_df = _forecast(ds, y, horizon).rename(columns={
+        'ds': 'Date', 'yhat': 'Predicted Close', 'yhat_lower': 'Lower Bound', 'yhat_upper': 'Upper Bound'
+    })
+
     # Create prediction chart
     fig = px.line(pred_df, x='Date', y='Predicted Close', title=f"Price Prediction ({horizon} Days)")
     fig.add_scatter(x=pred_df['Date'], y=pred_df['Lower Bound'], mode='lines', name='Lower Bound', line=dict(dash='dash'))
     fig.add_scatter(x=pred_df['Date'], y=pred_df['Upper Bound'], mode='lines', name='Upper Bound', line=dict(dash='dash'))
-    
+
     return pred_df, fig
@@ -1,17 +1,28 @@
 import pandas as pd
+import numpy as np
+import streamlit as st
+from utils._cache import FRAME_CACHE_ENTRIES, frame_fingerprint
 
+# Signals are stored as 1-byte category codes rather than Python strings
+SIGNAL_DTYPE = pd.CategoricalDtype(['Hold', 'Buy', 'Sell'])
+
+def _signal(sell, buy):
+    """Build a categorical signal column; Sell takes precedence where both masks hold."""
+    codes = np.select([sell, buy], [2, 1], default=0).astype(np.int8)
+    return pd.Categorical.from_codes(codes, dtype=SIGNAL_DTYPE)
+
+@st.cache_data(show_spinner=False, max_entries=FRAME_CACHE_ENTRIES, hash_funcs={pd.DataFrame: frame_fingerprint})
 def apply_strategies(data):
     """Apply trading strategies: Mean Reversion and Momentum."""
-    df = data.copy()
-    
-    # Mean Reversion: Buy when price < SMA_20 by 5%, Sell when > SMA_20 by 5%
-    df['Mean_Reversion_Signal'] = 'Hold'
-    df.loc[df['close'] < df['SMA_20'] * 0.95, 'Mean_Reversion_Signal'] = 'Buy'
-    df.loc[df['close'] > df['SMA_20'] * 1.05, 'Mean_Reversion_Signal'] = 'Sell'
-    
-    # Momentum: Buy when RSI < 30, Sell when RSI > 70
-    df['Momentum_Signal'] = 'Hold'
-    df.loc[df['RSI_14'] < 30, 'Momentum_Signal'] = 'Buy'
-    df.loc[df['RSI_14'] > 70, 'Momentum_Signal'] = 'Sell'
-    
-    return df
+    close = data['close'].to_numpy()
+    sma = data['SMA_20'].to_numpy()
+    rsi = data['RSI_14'].to_numpy()
+
+    signals = pd.DataFrame({
+        # Mean Reversion: Buy when price < SMA_20 by 5%, Sell when > SMA_20 by 5%
+        'Mean_Reversion_Signal': _signal(close > sma * 1.05, close < sma * 0.95),
+        # Momentum: Buy when RSI < 30, Sell when RSI > 70
+        'Momentum_Signal': _signal(rsi > 70, rsi < 30)
+    }, index=data.index)
+
+    return pd.concat([data, signals], axis=1, copy=False)
@@ -1,13 +1,19 @@
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-from datetime import datetime
+import numpy as np
+import streamlit as st
+import calendar
+from utils._cache import FRAME_CACHE_ENTRIES, frame_fingerprint
 
 def create_monthly_pl_table(pl_data, period):
     """Create a monthly P/L table/chart with years as rows and months as columns."""
-    pl_data['Year'] = pl_data.index.year
-    pl_data['Month'] = pl_data.index.month_name()
-    monthly_pl = pl_data.groupby(['Year', 'Month'])['% P/L'].mean().unstack().fillna(0)
+    # Group on integer year/month keys; month names are only needed for display
+    monthly_pl = pd.pivot_table(pl_data, values='% P/L',
+                                index=pl_data.index.year.rename('Year'),
+                                columns=pl_data.index.month.rename('Month'),
+                                aggfunc='mean', fill_value=0)
+    monthly_pl.columns = [calendar.month_name[month] for month in monthly_pl.columns]
     fig = px.imshow(monthly_pl, 
                     labels=dict(x="Month", y="Year", color="% P/L"),
                     x=monthly_pl.columns,
@@ -16,8 +22,27 @@ def create_monthly_pl_table(pl_data, period):
     fig.update_layout(title="Monthly % P/L Comparison")
     return fig
 
+# Candlestick traces are bucketed down to this many points; more than a screen's width adds only payload
+MAX_CHART_POINTS = 2000
+
+def _downsample(pl_data, max_points=MAX_CHART_POINTS):
+    """Aggregate consecutive rows into at most max_points OHLC buckets for plotting."""
+    if len(pl_data) <= max_points:
+        return pl_data
+    step = -(-len(pl_data) // max_points)
+    buckets = np.arange(len(pl_data)) // step
+    agg = {col: 'last' for col in ('SMA_20', 'RSI_14', 'MACD', 'MACD_Signal') if col in pl_data.columns}
+    agg.update(open='first', high='max', low='min', close='last', volume='sum')
+    sampled = pl_data.groupby(buckets).agg(agg)
+    sampled.index = pl_data.index[::step]
+    return sampled
+
+@st.cache_data(show_spinner=False, max_entries=FRAME_CACHE_ENTRIES, hash_funcs={pd.DataFrame: frame_fingerprint})
 def create_candlestick_chart(pl_data):
     """Create an interactive candlestick chart with volume and indicators."""
+    # Anomalies are sparse, so they are marked from the full-resolution data
+    anomalies = pl_data[pl_data['Anomaly Flag']]
+    pl_data = _downsample(pl_data)
     fig = go.Figure()
     
     # Candlestick
@@ -76,7 +101,6 @@ def create_candlestick_chart(pl_data):
         ))
     
     # Anomaly Markers
-    anomalies = pl_data[pl_data['Anomaly Flag']]
     if not anomalies.empty:
         fig.add_trace(go.Scatter(
             x=anomalies.index,
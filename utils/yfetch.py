@@ -1,49 +1,557 @@
 import pandas as pd
+import numpy as np
 import yfinance as yf
+import functools
 import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import requests
+import requests_cache
 import streamlit as st
+from numba import njit
+from requests.adapters import HTTPAdapter
+from urllib.parse import parse_qs, urlparse
+from urllib3.util.retry import Retry
+from utils._cache import (CACHE_FALLBACK, DEFAULT_TTL, HISTORICAL_TTL, INTRADAY_TTL, get_cached, make_key,
+                          put_cached, read_frame, write_frame)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@st.cache_data(ttl=60)
-def fetch_yfinance_data(stock_symbol, start_date=None, end_date=None, period="max", interval="1d"):
-    """Fetch stock data from yfinance for the given symbol and period or date range."""
+def _http_cacheable(response):
+    """Keep intraday bars out of the HTTP cache; their freshness is governed by INTRADAY_TTL and the real-time bypass."""
+    interval = parse_qs(urlparse(response.url).query).get("interval", ["1d"])[0]
+    return interval.endswith(("d", "wk", "mo"))
+
+# HTTP-level cache shared by all yfinance requests; being disk-backed it outlives
+# st.cache_data expiry and app restarts, so repeat fetches skip the network
+SESSION = requests_cache.CachedSession('.yf_cache', backend='sqlite', expire_after=300, filter_fn=_http_cacheable)
+# Keep-alive connection pool with transient-error retries, so concurrent fetches reuse TLS connections;
+# 429 is left out so the response, with its Retry-After, reaches _download's retry policy
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+))
+
+# Yahoo rejects requests without a browser-like User-Agent
+SESSION.headers['User-Agent'] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+
+# Seconds before a request on a dead connection is abandoned, so retries don't stack behind it
+REQUEST_TIMEOUT = 15
+
+# Yahoo's chart endpoint, which yfinance wraps; single-symbol fetches query it directly
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+
+# OHLCV columns kept from a download
+_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Periods yfinance understands natively; other codes are mapped to a start/end range
+_YF_PERIODS = {"1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max"}
+
+# Spans of the period codes yfinance doesn't understand, built once as Timedeltas;
+# YTD depends on the date so it is computed per call, and unknown codes get a year
+_PERIOD_DELTAS = {code: pd.Timedelta(days=days) for code, days in
+                  {"1D": 1, "5D": 5, "1M": 30, "1Y": 365, "5Y": 1825, "10Y": 3650}.items()}
+_DEFAULT_DELTA = pd.Timedelta(days=365)
+
+# Calendar spans of the native periods served from the per-symbol history store;
+# 1d/5d count trading days and max has no start, so those always download
+_PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10)
+}
+
+# Fraction by which disk-cache lifetimes are randomly stretched or shortened
+TTL_JITTER = 0.15
+
+# Shorter periods fetch_yfinance_data may retry when the requested one has no data
+FALLBACK_PERIODS = ("1mo", "1y")
+
+# Download attempts, and the base delay in seconds that doubles after each failed attempt
+RETRIES = 3
+RETRY_DELAY = 5
+# Longest Retry-After from a 429 that is honoured before retrying
+MAX_RETRY_AFTER = 60
+
+# Failures that mean the symbol or range doesn't exist and are never retried
+PERMANENT_STATUSES = {400, 404}
+PERMANENT_MESSAGES = ("delisted", "invalid symbol")
+
+# Worker threads for fetch_many; fetches wait on the network, not the CPU
+MAX_WORKERS = 8
+
+# Symbols per yf.download call; Yahoo rejects larger multi-symbol requests
+BATCH_SIZE = 20
+
+# Symbols that have already returned data in this process; a successful download
+# is proof enough that the symbol exists, so they skip the validation probe
+_KNOWN_GOOD = set()
+
+# Requests that recently returned no data, mapped to when that answer expires, so
+# mistyped or delisted symbols fail fast instead of re-running the retry backoff
+_NEGATIVE = OrderedDict()
+_NEGATIVE_LOCK = threading.Lock()
+NEGATIVE_TTL = 300
+NEGATIVE_MAX = 1024
+
+# Futures of the fetch_yfinance_data calls currently running, keyed by their arguments
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=512)
+def get_ticker(symbol):
+    """Return a process-wide shared yfinance Ticker for the symbol."""
+    return yf.Ticker(symbol, session=SESSION)
+
+def is_valid_symbol(symbol):
+    """Check whether Yahoo knows the symbol: True or False, or None when it can't be reached to say."""
+    # Checked outside the probe, so a later successful fetch overrides an earlier False
+    if symbol in _KNOWN_GOOD:
+        return True
+    # Only a definite "not found" is remembered, and only for NEGATIVE_TTL seconds
+    if _is_negative(("symbol", symbol)):
+        return False
+    return _probe_symbol(symbol)
+
+def _probe_symbol(symbol):
+    """Probe the chart endpoint for a few recent bars; yfinance's fast_info hides outages behind missing fields."""
     try:
-        logger.info(f"Fetching data for {stock_symbol}, period: {period}, start: {start_date}, end: {end_date}")
-        if period == "real-time":
-            data = yf.download(stock_symbol, period="1d", interval="1m")
-        elif period == "max":
-            data = yf.download(stock_symbol, period="max", interval=interval)
-        else:
-            if start_date is None or end_date is None:
-                end_date = pd.to_datetime('today')
-                period_days = {
-                    "1D": 1,
-                    "5D": 5,
-                    "1M": 30,
-                    "YTD": (pd.to_datetime('today') - pd.Timestamp(year=pd.to_datetime('today').year, month=1, day=1)).days,
-                    "1Y": 365,
-                    "5Y": 1825,
-                    "10Y": 3650
-                }.get(period, 365)
-                start_date = end_date - pd.Timedelta(days=period_days)
-            data = yf.download(stock_symbol, start=start_date, end=end_date, interval=interval)
-        if data.empty:
-            logger.warning(f"No data found for {stock_symbol} in period {period}")
-            return pd.DataFrame()
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = data.columns.get_level_values(0)
-        if not data.index.is_monotonic_increasing:
-            data = data.sort_index()
-        if data.index.duplicated().any():
-            logger.warning(f"Duplicate indices found for {stock_symbol}. Dropping duplicates.")
-            data = data[~data.index.duplicated(keep='first')]
-        if data.index.tz is not None:
-            data.index = data.index.tz_localize(None)
-        logger.info(f"Successfully fetched data for {stock_symbol}")
-        return data
+        found = not _fetch_chart(symbol, period="5d", interval="1d").empty
     except Exception as e:
-        logger.error(f"fetch_yfinance_data error for {stock_symbol}: {str(e)}")
+        if not _is_permanent(e):
+            logger.warning(f"Symbol validation failed for {symbol}: {str(e)}")
+            return None
+        found = False
+    if found:
+        _KNOWN_GOOD.add(symbol)
+    else:
+        _remember_negative(("symbol", symbol))
+    return found
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def symbol_range(symbol):
+    """Return the (first, last) trading dates Yahoo has for the symbol, or None if it has none."""
+    ticker = get_ticker(symbol)
+    # A 5-day probe carries the full-history metadata without downloading the full history
+    recent = ticker.history(period="5d", interval="1d", actions=False, timeout=REQUEST_TIMEOUT)
+    if recent.empty:
+        return None
+    first_trade = ticker.history_metadata.get('firstTradeDate')
+    first_date = pd.Timestamp(first_trade, unit='s').date() if first_trade else recent.index[0].date()
+    return first_date, recent.index[-1].date()
+
+@njit(cache=True)
+def _post_process(stamps):
+    """Return the rows that sort int64 stamps keeping the first of each duplicate, or an empty array if none move."""
+    n = stamps.shape[0]
+    clean = True
+    for i in range(1, n):
+        if stamps[i] <= stamps[i - 1]:
+            clean = False
+            break
+    if clean:
+        return np.empty(0, np.int64)
+    order = np.argsort(stamps, kind='mergesort')
+    rows = np.empty(n, np.int64)
+    count = 0
+    for i in range(n):
+        if i == 0 or stamps[order[i]] != stamps[order[i - 1]]:
+            rows[count] = order[i]
+            count += 1
+    return rows[:count]
+
+# Compile (or load the on-disk cached build) at import rather than on the first fetch
+_post_process(np.zeros(2, np.int64))
+
+def _normalize_frame(data, symbol):
+    """Project a downloaded frame onto OHLCV with a sorted, unique, tz-naive index, built in one pass over its arrays."""
+    index = data.index
+    if getattr(index, 'tz', None) is not None:
+        index = index.tz_localize(None)
+    stamps = index.to_numpy()
+    columns = {col: data[col].to_numpy() for col in _COLUMNS if col in data.columns}
+    rows = _post_process(stamps.view(np.int64))
+    # Clean frames, the usual case, are passed through without reordering any array
+    if len(rows):
+        if len(rows) < len(stamps):
+            logger.warning(f"Duplicate indices found for {symbol}. Dropping duplicates.")
+        stamps = stamps[rows]
+        columns = {col: values[rows] for col, values in columns.items()}
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(stamps, name=data.index.name))
+
+def _downcast(data, dtype):
+    """Store prices as dtype ("float32" or "float64") and volume as int32 where every value fits."""
+    if dtype == "float64" or data.empty:
+        return data
+    casts = {col: dtype for col in ('Open', 'High', 'Low', 'Close') if col in data.columns}
+    volume = data.get('Volume')
+    # Index volumes (e.g. ^GSPC) exceed 2**31, so only narrow when the values allow it
+    if volume is not None and pd.api.types.is_integer_dtype(volume) and volume.max() <= np.iinfo(np.int32).max:
+        casts['Volume'] = 'int32'
+    return data.astype(casts, copy=False)
+
+def _fetch_chart(symbol, start=None, end=None, period=None, interval="1d"):
+    """Fetch one symbol's bars from the chart JSON endpoint, building the frame column-wise from its arrays."""
+    params = {"interval": interval, "includeAdjustedClose": "true"}
+    local_range = None
+    if start is not None:
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if start.tz is None:
+            # Naive dates are the exchange's local dates, but period1/period2 are UTC epochs; pad
+            # by a day either side and trim once the response names the exchange's timezone
+            local_range = start, end
+            start, end = start - pd.Timedelta(days=1), end + pd.Timedelta(days=1)
+        params["period1"] = int(start.timestamp())
+        params["period2"] = int(end.timestamp())
+    else:
+        params["range"] = period
+    response = SESSION.get(CHART_URL.format(symbol=symbol), params=params, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    result = response.json()["chart"]["result"]
+    if not result or "timestamp" not in result[0]:
         return pd.DataFrame()
+    result = result[0]
+    quote = result["indicators"]["quote"][0]
+    close = np.asarray(quote["close"], dtype=np.float64)
+    adjclose = result["indicators"].get("adjclose")
+    index = pd.to_datetime(np.asarray(result["timestamp"], dtype=np.int64), unit="s", utc=True)
+    timezone = result["meta"]["exchangeTimezoneName"]
+    index = index.tz_convert(timezone)
+    if interval.endswith(("d", "wk", "mo")):
+        # Daily and longer bars are stamped at the open; date them at midnight like yfinance
+        index = index.normalize().rename("Date")
+    else:
+        index = index.rename("Datetime")
+    data = pd.DataFrame({
+        "Open": np.asarray(quote["open"], dtype=np.float64),
+        "High": np.asarray(quote["high"], dtype=np.float64),
+        "Low": np.asarray(quote["low"], dtype=np.float64),
+        "Close": close,
+        "Adj Close": np.asarray(adjclose[0]["adjclose"], dtype=np.float64) if adjclose else close,
+        "Volume": np.asarray(quote["volume"], dtype=np.float64)
+    }, index=index)
+    if local_range is not None:
+        start, end = (t.tz_localize(timezone, ambiguous=False, nonexistent="shift_forward") for t in local_range)
+        data = data[(data.index >= start) & (data.index < end)]
+    data = data.dropna(subset=["Open", "High", "Low", "Close"], how="all")
+    data["Volume"] = data["Volume"].fillna(0).astype(np.int64)
+    return data
+
+class DownloadError(Exception):
+    """Every download attempt failed for reasons that may clear up, such as timeouts, 5xx or rate limits."""
+
+def _status(error):
+    """HTTP status code carried by a request error, or None."""
+    response = getattr(error, "response", None)
+    return response.status_code if response is not None else None
+
+def _is_permanent(error):
+    """Whether an error means the symbol or range doesn't exist, so retrying can't help."""
+    if _status(error) in PERMANENT_STATUSES:
+        return True
+    message = str(error).lower()
+    return any(text in message for text in PERMANENT_MESSAGES)
+
+def _retry_delay(error, attempt):
+    """Seconds to wait after a failed attempt: Yahoo's Retry-After on a 429, otherwise full-jitter backoff."""
+    if _status(error) == 429:
+        retry_after = error.response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(int(retry_after), MAX_RETRY_AFTER)
+    # Random waits keep concurrent workers from retrying in lockstep
+    return random.uniform(0, RETRY_DELAY * 2 ** (attempt - 1))
+
+def _fetch_single(symbol, **kwargs):
+    """Fetch one symbol from the chart endpoint, falling back to Ticker.history if its response can't be used."""
+    try:
+        return _fetch_chart(symbol, **kwargs)
+    except Exception as e:
+        # Rate limits, exhausted adapter retries and unknown symbols would fail the same way
+        # through yfinance, so repeating the request there only adds load
+        if isinstance(e, requests.exceptions.RetryError) or _status(e) == 429 or _is_permanent(e):
+            raise
+        logger.warning(f"Chart endpoint failed for {symbol}, falling back to yfinance: {str(e)}")
+        # Ticker.history keeps no module-level state, unlike yf.download, so it is safe across threads
+        # raise_errors surfaces "possibly delisted" and similar as exceptions for the retry policy to classify
+        return get_ticker(symbol).history(actions=False, auto_adjust=False, raise_errors=True,
+                                          timeout=REQUEST_TIMEOUT, **kwargs)
+
+def _download(symbols, **kwargs):
+    """Download symbols with jittered retries; returns an empty frame only when Yahoo has no data for them.
+
+    Raises DownloadError when the last attempt failed with a transient error, so callers can tell an
+    outage apart from a symbol or range that doesn't exist.
+    """
+    for attempt in range(1, RETRIES + 1):
+        error = None
+        try:
+            if len(symbols) == 1:
+                data = _fetch_single(symbols[0], **kwargs)
+            else:
+                data = yf.download(" ".join(symbols), group_by='ticker', threads=True, progress=False,
+                                   timeout=REQUEST_TIMEOUT, session=SESSION, **kwargs)
+            if data is not None and not data.empty:
+                return data
+            logger.warning(f"Attempt {attempt}: Empty data for {symbols}")
+        except Exception as e:
+            if _is_permanent(e):
+                logger.error(f"Not retrying {symbols}: {str(e)}")
+                return pd.DataFrame()
+            logger.error(f"Attempt {attempt} failed for {symbols}: {str(e)}")
+            error = e
+        if attempt < RETRIES:
+            time.sleep(_retry_delay(error, attempt))
+    if error is not None:
+        raise DownloadError(f"Download failed for {symbols}: {str(error)}") from error
+    if len(symbols) > 1:
+        # A whole batch coming back empty looks like an outage rather than a set of bad symbols
+        raise DownloadError(f"No data returned for any of {symbols}")
+    return pd.DataFrame()
+
+def _request_kwargs(period, start_date, end_date, interval, now):
+    """Translate a period code or date range into yf.download arguments."""
+    if period == "real-time":
+        return {"period": "1d", "interval": "1m"}
+    if start_date is not None and end_date is not None:
+        return {"start": start_date, "end": end_date, "interval": interval}
+    if period in _YF_PERIODS:
+        return {"period": period, "interval": interval}
+    if period == "YTD":
+        delta = pd.Timedelta(days=(now - now.replace(month=1, day=1)).days)
+    else:
+        delta = _PERIOD_DELTAS.get(period, _DEFAULT_DELTA)
+    return {"start": now - delta, "end": now, "interval": interval}
+
+def _cache_ttl(period, end_date, interval, now):
+    """Seconds a downloaded frame stays fresh on disk for the given request, jittered by up to TTL_JITTER."""
+    if period == "real-time" or not interval.endswith(("d", "wk", "mo")):
+        ttl = INTRADAY_TTL
+    elif end_date is not None and pd.Timestamp(end_date) < now.normalize():
+        ttl = HISTORICAL_TTL
+    else:
+        ttl = DEFAULT_TTL
+    # Each read draws its own lifetime, so entries written together don't all refetch together
+    return ttl * random.uniform(1 - TTL_JITTER, 1 + TTL_JITTER)
+
+def _history_range(kwargs, now):
+    """Return the (start, end) a daily request covers, or None if it can't use the history store."""
+    if kwargs.get("interval") != "1d":
+        return None
+    if "start" in kwargs:
+        return pd.Timestamp(kwargs["start"]), pd.Timestamp(kwargs["end"])
+    if kwargs.get("period") == "ytd":
+        return now.replace(month=1, day=1).normalize(), now
+    offset = _PERIOD_OFFSETS.get(kwargs.get("period"))
+    # Start at midnight so the bar dated on the start day passes `index >= start`
+    return ((now - offset).normalize(), now) if offset is not None else None
+
+def _fetch_incremental(symbol, start, end):
+    """Serve a daily range from the history store, downloading only the bars after it; None if it doesn't cover start."""
+    history = get_cached(symbol)
+    if history is None or history.empty or pd.Timestamp(history.attrs['start']) > start:
+        return None
+    if pd.Timestamp(history.attrs['end']) < end:
+        # Start from the last stored bar too, since it may have been a partial intraday bar
+        try:
+            tail = _download([symbol], start=history.index[-1], end=end, interval="1d")
+        except DownloadError as e:
+            if not CACHE_FALLBACK:
+                return None
+            # Yahoo is failing or throttling; the stored bars beat retrying the full range
+            logger.warning(f"Serving stored history for {symbol} without its latest bars: {str(e)}")
+            data = history[(history.index >= start) & (history.index < end)]
+            data.attrs['expired'] = True
+            return data if not data.empty else None
+        if tail.empty:
+            return None
+        tail = _normalize_frame(tail, symbol)
+        attrs = {'start': history.attrs['start'], 'end': end.isoformat()}
+        overlap = history.index[-1]
+        # A split re-adjusts every past bar; the last stored bar is refetched, so a changed
+        # open there means the stored bars no longer line up with Yahoo's and must be rebuilt
+        if overlap not in tail.index or not np.isclose(tail.at[overlap, 'Open'], history.at[overlap, 'Open'], rtol=1e-3, equal_nan=True):
+            logger.info(f"Stored history for {symbol} no longer matches Yahoo's adjusted bars; rebuilding it")
+            try:
+                tail = _download([symbol], start=pd.Timestamp(history.attrs['start']), end=end, interval="1d")
+            except DownloadError:
+                return None
+            if tail.empty:
+                return None
+            tail = _normalize_frame(tail, symbol)
+            history = history.iloc[:0]
+        history = pd.concat([history[history.index < tail.index[0]], tail])
+        history.attrs = attrs
+        put_cached(symbol, history)
+    data = history[(history.index >= start) & (history.index < end)]
+    return data if not data.empty else None
+
+def _seed_history(symbol, data, start, end):
+    """Start the symbol's history store from a full download unless the existing one already reaches further back."""
+    history = get_cached(symbol)
+    if history is not None and pd.Timestamp(history.attrs['start']) <= start:
+        return
+    data = data.copy()
+    data.attrs = {'start': start.isoformat(), 'end': end.isoformat()}
+    put_cached(symbol, data)
+
+def _is_negative(key):
+    """Whether the request under key came back empty within the last NEGATIVE_TTL seconds."""
+    with _NEGATIVE_LOCK:
+        expiry = _NEGATIVE.get(key)
+        if expiry is None:
+            return False
+        if expiry <= time.time():
+            del _NEGATIVE[key]
+            return False
+        _NEGATIVE.move_to_end(key)
+        return True
+
+def _remember_negative(key):
+    """Record that the request under key came back empty, evicting the oldest entries beyond NEGATIVE_MAX."""
+    with _NEGATIVE_LOCK:
+        _NEGATIVE[key] = time.time() + NEGATIVE_TTL
+        _NEGATIVE.move_to_end(key)
+        while len(_NEGATIVE) > NEGATIVE_MAX:
+            _NEGATIVE.popitem(last=False)
+
+def _split_batch(data, symbol):
+    """Slice one symbol's columns out of a group_by='ticker' download."""
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol not in data.columns.get_level_values(0):
+            return pd.DataFrame()
+        data = data.xs(symbol, axis=1, level=0)
+    # The batched frame is outer-joined across symbols, so drop dates this symbol didn't trade
+    return data.dropna(how='all')
+
+@st.cache_data(ttl=60)
+def fetch_yfinance_data_batch(symbols, start_date=None, end_date=None, period="max", interval="1d", dtype="float32"):
+    """Fetch several symbols with one yfinance request per BATCH_SIZE symbols, returning a dict of symbol to DataFrame."""
+    symbols = list(dict.fromkeys(symbols))
+    # Checked once so the per-symbol f-strings below aren't formatted when INFO is off
+    verbose = logger.isEnabledFor(logging.INFO)
+    if verbose:
+        logger.info(f"Fetching data for {symbols}, period: {period}, start: {start_date}, end: {end_date}")
+    # Real-time minute bars go stale too quickly to be worth a disk round-trip
+    use_disk_cache = period != "real-time"
+    # One clock read per call, shared by every period and TTL calculation below
+    now = pd.Timestamp.now()
+    max_age = _cache_ttl(period, end_date, interval, now)
+    keys = {symbol: make_key(symbol, period, start_date, end_date, interval) for symbol in symbols}
+    kwargs = _request_kwargs(period, start_date, end_date, interval, now)
+    history_range = _history_range(kwargs, now) if use_disk_cache else None
+    frames = {}
+    missing = []
+    for symbol in symbols:
+        if _is_negative(keys[symbol]):
+            if verbose:
+                logger.info(f"Skipping {symbol}: no data was found for this request recently")
+            frames[symbol] = pd.DataFrame()
+            continue
+        cached = read_frame(keys[symbol], max_age=max_age) if use_disk_cache else None
+        if cached is not None:
+            if verbose:
+                logger.info(f"Loaded cached data for {symbol}")
+        elif history_range is not None:
+            cached = _fetch_incremental(symbol, *history_range)
+            if cached is not None:
+                if verbose:
+                    logger.info(f"Extended cached history for {symbol}")
+                write_frame(keys[symbol], cached)
+        if cached is not None:
+            _KNOWN_GOOD.add(symbol)
+            frames[symbol] = cached
+        else:
+            missing.append(symbol)
+    
+    for i in range(0, len(missing), BATCH_SIZE):
+        chunk = missing[i:i + BATCH_SIZE]
+        # Only a definitive empty answer is negative-cached; an outage must not block valid symbols
+        failed = False
+        try:
+            data = _download(chunk, **kwargs)
+        except Exception as e:
+            logger.error(f"fetch_yfinance_data_batch error for {chunk}: {str(e)}")
+            data = pd.DataFrame()
+            failed = True
+        for symbol in chunk:
+            frame = _split_batch(data, symbol) if not data.empty else data
+            if frame.empty:
+                stale = read_frame(keys[symbol]) if CACHE_FALLBACK and use_disk_cache else None
+                if stale is not None:
+                    # Yahoo is failing or throttling; an old copy beats an error page
+                    logger.warning(f"Serving expired cached data for {symbol}")
+                    stale.attrs['expired'] = True
+                    frames[symbol] = stale
+                else:
+                    if failed:
+                        logger.warning(f"Download failed for {symbol} and no cached copy exists")
+                    else:
+                        logger.warning(f"No data found for {symbol} in period {period}")
+                        _remember_negative(keys[symbol])
+                    frames[symbol] = pd.DataFrame()
+                continue
+            frame = _normalize_frame(frame, symbol)
+            _KNOWN_GOOD.add(symbol)
+            if use_disk_cache:
+                write_frame(keys[symbol], frame)
+            if history_range is not None:
+                _seed_history(symbol, frame, *history_range)
+            frames[symbol] = frame
+    # Frames are stored on disk at full precision and downcast on the way out
+    return {symbol: _downcast(frame, dtype) for symbol, frame in frames.items()}
+
+def _fetch_coalesced(stock_symbol, start_date, end_date, period, interval, dtype):
+    """Fetch one symbol, sharing the result with identical calls made while it runs."""
+    # st.cache_data only dedupes finished calls; identical calls made while one is running wait on it instead
+    key = (stock_symbol, start_date, end_date, period, interval, dtype)
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = _INFLIGHT[key] = Future()
+    if not owner:
+        return future.result().copy()
+    try:
+        data = fetch_yfinance_data_batch([stock_symbol], start_date, end_date, period, interval, dtype)[stock_symbol]
+        future.set_result(data)
+        return data
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            del _INFLIGHT[key]
+
+def fetch_yfinance_data(stock_symbol, start_date=None, end_date=None, period="max", interval="1d", fallback="none",
+                        dtype="float32"):
+    """Fetch stock data for a period or date range; fallback ("1mo", "1y" or "none") is retried if that has no data."""
+    data = _fetch_coalesced(stock_symbol, start_date, end_date, period, interval, dtype)
+    if data.empty and fallback in FALLBACK_PERIODS and fallback != period:
+        logger.warning(f"No data for {stock_symbol} in period {period}, falling back to {fallback}")
+        data = _fetch_coalesced(stock_symbol, None, None, fallback, interval, dtype).copy(deep=False)
+        if not data.empty:
+            data.attrs['fallback'] = fallback
+    return data
+
+def fetch_many(symbol_specs):
+    """Fetch symbols that need their own arguments concurrently, returning a dict of symbol to DataFrame."""
+    frames = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(fetch_yfinance_data, **spec): spec["stock_symbol"] for spec in symbol_specs}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                frames[symbol] = future.result()
+            except Exception as e:
+                # Keep the symbols that did load rather than failing the whole set
+                logger.error(f"fetch_many error for {symbol}: {str(e)}")
+                frames[symbol] = pd.DataFrame()
+    return frames